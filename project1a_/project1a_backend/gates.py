@@ -1,31 +1,87 @@
+from functools import lru_cache
+
 import numpy as np
+from numpy import cos, sin, exp
+
+# ---------- Quantum Gate Definitions ----------
+# Single source of the 2x2 gate matrices used by the backend.
+# Fixed gates are module-level constants built once at import time and
+# marked read-only, so they can be shared across steps and requests.
+
+
+def _frozen(U):
+    U.flags.writeable = False
+    return U
+
+
+# Identity.
+I = _frozen(np.eye(2, dtype=complex))
+
+# Pauli-X (NOT) gate: flips |0> to |1> and |1> to |0>,
+# analogous to a classical bit flip.
+#     [[0, 1],
+#      [1, 0]]
+X = _frozen(np.array([[0, 1],
+                      [1, 0]], dtype=complex))
+
+# Pauli-Y gate.
+#     [[0, -i],
+#      [i,  0]]
+Y = _frozen(np.array([[0, -1j],
+                      [1j, 0]], dtype=complex))
+
+# Pauli-Z gate (phase flip).
+#     [[1,  0],
+#      [0, -1]]
+Z = _frozen(np.array([[1, 0],
+                      [0, -1]], dtype=complex))
+
+# Hadamard gate: creates superposition by mapping
+#     |0> → (|0> + |1>) / sqrt(2)
+#     |1> → (|0> - |1>) / sqrt(2)
+#     (1/sqrt(2)) * [[ 1,  1],
+#                    [ 1, -1]]
+H = _frozen((1 / np.sqrt(2)) * np.array([[1,  1],
+                                         [1, -1]], dtype=complex))
+
+
+# Rotations are memoized on the exact angle: UI sliders and parameter sweeps
+# revisit the same handful of θ values, so repeated steps become a dict lookup.
+
+def Rx(theta: float):
+    """Rotation around the X-axis by angle θ."""
+    return _rx(float(theta))
+
+
+def Ry(theta: float):
+    """Rotation around the Y-axis by angle θ."""
+    return _ry(float(theta))
+
+
+def Rz(theta: float):
+    """Rotation around the Z-axis by angle θ."""
+    return _rz(float(theta))
+
+
+@lru_cache(maxsize=1024)
+def _rx(theta: float):
+    return _frozen(np.array([
+        [cos(theta/2), -1j*sin(theta/2)],
+        [-1j*sin(theta/2), cos(theta/2)]
+    ], dtype=complex))
+
+
+@lru_cache(maxsize=1024)
+def _ry(theta: float):
+    return _frozen(np.array([
+        [cos(theta/2), -sin(theta/2)],
+        [sin(theta/2),  cos(theta/2)]
+    ], dtype=complex))
+
 
-def pauli_x():
-    """
-    Return the 2x2 matrix representation of the Pauli-X (NOT) gate.
-    
-    The Pauli-X gate flips |0> to |1> and |1> to |0>, 
-    analogous to a classical bit flip.
-    
-    Matrix form:
-        [[0, 1],
-         [1, 0]]
-    """
-    return np.array([[0, 1],
-                     [1, 0]], dtype=complex)
-
-
-def hadamard():
-    """
-    Return the 2x2 matrix representation of the Hadamard gate.
-    
-    The Hadamard gate creates superposition by mapping:
-        |0> → (|0> + |1>) / sqrt(2)
-        |1> → (|0> - |1>) / sqrt(2)
-    
-    Matrix form:
-        (1/sqrt(2)) * [[ 1,  1],
-                       [ 1, -1]]
-    """
-    return (1 / np.sqrt(2)) * np.array([[1,  1],
-                                        [1, -1]], dtype=complex)
+@lru_cache(maxsize=1024)
+def _rz(theta: float):
+    return _frozen(np.array([
+        [exp(-1j*theta/2), 0],
+        [0, exp(1j*theta/2)]
+    ], dtype=complex))
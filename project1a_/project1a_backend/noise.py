@@ -1,11 +1,33 @@
+from functools import lru_cache
+from math import sqrt
+
 import numpy as np
 
+from gates import I as _I, X as _X, Y as _Y, Z as _Z
+
 # ---------- Quantum Noise Channels ----------
-# Each function returns a list of Kraus operators {K_i} that describe
-# a completely positive trace-preserving (CPTP) map. These operators
-# model how realistic noise affects quantum states.
+# Each function returns the Kraus operators {K_i} of a completely positive
+# trace-preserving (CPTP) map, stacked into a (k, 2, 2) array so channels
+# can be applied as one vectorized contraction. These operators model how
+# realistic noise affects quantum states.
+#
+# Results are memoized per parameter value (frontends sweep a small set of
+# values), so the returned stacks are shared and marked read-only.
+
+_P0 = np.array([[1, 0],
+                [0, 0]], dtype=complex)
+_P1 = np.array([[0, 0],
+                [0, 1]], dtype=complex)
+
 
+def _frozen(*ops):
+    """Stack Kraus operators into a read-only (k, 2, 2) array safe to cache."""
+    Ks = np.stack(ops)
+    Ks.flags.writeable = False
+    return Ks
 
+
+@lru_cache(maxsize=128)
 def amplitude_damping(gamma: float):
     """
     Amplitude damping noise channel.
@@ -25,15 +47,18 @@ def amplitude_damping(gamma: float):
         gamma (float): damping probability, 0 ≤ γ ≤ 1
 
     Returns:
-        List[np.ndarray]: two Kraus operators [K0, K1]
+        np.ndarray: stacked Kraus operators [K0, K1], shape (2, 2, 2)
     """
+    s0 = sqrt(1 - gamma)
+    s1 = sqrt(gamma)
     K0 = np.array([[1, 0],
-                   [0, np.sqrt(1 - gamma)]], dtype=complex)
-    K1 = np.array([[0, np.sqrt(gamma)],
+                   [0, s0]], dtype=complex)
+    K1 = np.array([[0, s1],
                    [0, 0]], dtype=complex)
-    return [K0, K1]
+    return _frozen(K0, K1)
 
 
+@lru_cache(maxsize=128)
 def phase_damping(lmbda: float):
     """
     Phase damping noise channel.
@@ -52,16 +77,15 @@ def phase_damping(lmbda: float):
         lmbda (float): dephasing probability, 0 ≤ λ ≤ 1
 
     Returns:
-        List[np.ndarray]: three Kraus operators [K0, K1, K2]
+        np.ndarray: stacked Kraus operators [K0, K1, K2], shape (3, 2, 2)
     """
-    K0 = np.sqrt(1 - lmbda) * np.eye(2, dtype=complex)
-    K1 = np.sqrt(lmbda) * np.array([[1, 0],
-                                    [0, 0]], dtype=complex)
-    K2 = np.sqrt(lmbda) * np.array([[0, 0],
-                                    [0, 1]], dtype=complex)
-    return [K0, K1, K2]
+    K0 = sqrt(1 - lmbda) * _I
+    K1 = sqrt(lmbda) * _P0
+    K2 = sqrt(lmbda) * _P1
+    return _frozen(K0, K1, K2)
 
 
+@lru_cache(maxsize=128)
 def depolarizing(p: float):
     """
     Depolarizing noise channel.
@@ -79,19 +103,34 @@ def depolarizing(p: float):
         p (float): depolarizing probability, 0 ≤ p ≤ 1
 
     Returns:
-        List[np.ndarray]: four Kraus operators [K0, K1, K2, K3]
+        np.ndarray: stacked Kraus operators [K0, K1, K2, K3], shape (4, 2, 2)
     """
-    I = np.eye(2, dtype=complex)
-    X = np.array([[0, 1],
-                  [1, 0]], dtype=complex)
-    Y = np.array([[0, -1j],
-                  [1j, 0]], dtype=complex)
-    Z = np.array([[1, 0],
-                  [0, -1]], dtype=complex)
-
     # One common parameterization of the depolarizing channel
-    K0 = np.sqrt(1 - 3*p/4) * I
-    K1 = np.sqrt(p/4) * X
-    K2 = np.sqrt(p/4) * Y
-    K3 = np.sqrt(p/4) * Z
-    return [K0, K1, K2, K3]
+    K0 = sqrt(1 - 3*p/4) * _I
+    s = sqrt(p/4)
+    K1 = s * _X
+    K2 = s * _Y
+    K3 = s * _Z
+    return _frozen(K0, K1, K2, K3)
+
+
+def kraus_superoperator(kraus_ops):
+    """
+    Build the 4x4 superoperator (Liouvillian form) of a Kraus channel.
+
+    Acting on the row-major vectorization vec(ρ) = ρ.reshape(4):
+        vec(Σ K_i ρ K_i†) = L vec(ρ),   L = Σ K_i ⊗ conj(K_i)
+
+    so a whole channel becomes a single 4x4 matrix-vector product instead
+    of a loop over Kraus operators.
+
+    Args:
+        kraus_ops (np.ndarray): stacked Kraus operators, shape (k, 2, 2).
+
+    Returns:
+        np.ndarray: 4x4 complex superoperator (read-only).
+    """
+    Ks = np.asarray(kraus_ops, dtype=complex)
+    L = np.einsum("kij,klm->iljm", Ks, Ks.conj()).reshape(4, 4)
+    L.flags.writeable = False
+    return L
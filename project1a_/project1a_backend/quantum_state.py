@@ -1,15 +1,25 @@
+from math import sqrt
+from typing import Optional
+
 import numpy as np
 
+from quantum_state_kernels import sandwich, apply_kraus_kernel, FIXED_GATE_KERNELS
+
 class QuantumState:
     """
     Represents a single-qubit quantum state using the density matrix formalism.
     
     - By default, the state starts in |0><0| (the ground state).
     - Supports application of unitary gates and noisy channels (via Kraus ops).
-    - Maintains a history of states for circuit evolution tracking.
+    - Optionally maintains a history of states for circuit evolution tracking.
+
+    Storage: ρ lives in a single (2, 2, 2) float64 buffer of [re, im] pairs,
+    which is exactly the wire format of the API. `re` and `im` are float
+    views onto it and `state` is the complex128 view used by the kernels,
+    so serialization and Bloch extraction never convert complex ↔ float.
     """
 
-    def __init__(self, initial_state=None):
+    def __init__(self, initial_state=None, track_history: bool = False):
         """
         Initialize the quantum state.
 
@@ -17,28 +27,76 @@ class QuantumState:
             initial_state (np.ndarray, optional): 
                 A custom 2x2 density matrix to initialize with.
                 If None, defaults to |0><0|.
+            track_history (bool):
+                If True, append a copy of the state to `history` after every
+                operation. Off by default to avoid a copy per step.
 
         Notes:
             The density matrix must be Hermitian, positive semi-definite,
             and have trace = 1 to represent a valid quantum state.
         """
+        self._buf = np.zeros((2, 2, 2))
+        self.re = self._buf[..., 0]
+        self.im = self._buf[..., 1]
+        self._rho = self._buf.view(np.complex128)[..., 0]
+
         if initial_state is None:
             # Default: |0><0| density matrix
-            self.state = np.array([[1, 0],
-                                   [0, 0]], dtype=complex)
+            self.re[0, 0] = 1.0
         else:
             self.state = initial_state
-        # Keep a history of states (useful for visualization/debugging).
+        # Optional history of states (useful for visualization/debugging).
+        self.track_history = track_history
         self.history = []
 
     def reset(self):
         """
         Reset the quantum state back to the default |0><0|.
-        Clears out the state but not the history list.
+        Also clears the history list; `track_history` is kept.
+        """
+        # Reset the existing buffer so views handed out by `state` stay valid
+        self._buf[...] = 0.0
+        self.re[0, 0] = 1.0
+        self.history = []
+
+    @property
+    def state(self) -> np.ndarray:
+        """The 2x2 complex density matrix (a view; updated in place)."""
+        return self._rho
+
+    @state.setter
+    def state(self, rho: np.ndarray):
+        self._rho[...] = rho
+
+    def serialize(self) -> np.ndarray:
+        """
+        Return a copy of ρ as a (2, 2, 2) float64 array of [real, imag]
+        entries, ready for the JSON/msgpack response encoders.
+        """
+        return self._buf.copy()
+
+    def bloch_components(self):
+        """
+        Bloch vector (x, y, z) read directly from the real/imag parts of ρ:
+            x = 2 Re(ρ01),  y = 2 Im(ρ10),  z = Re(ρ00) - Re(ρ11)
+
+        Returns:
+            tuple: (x, y, z) as floats
+        """
+        ((a, _), (b_re, _)), ((_, c_im), (d, _)) = self._buf.tolist()
+        return (2.0 * b_re, 2.0 * c_im, a - d)
+
+    def bloch_vector(self):
+        """
+        Bloch vector as a dict (see bloch_components).
+
+        Returns:
+            dict: {"x": float, "y": float, "z": float}
         """
-        self.__init__()
+        x, y, z = self.bloch_components()
+        return {"x": x, "y": y, "z": z}
 
-    def apply_gate(self, U: np.ndarray):
+    def apply_gate(self, U: np.ndarray, name: Optional[str] = None):
         """
         Apply a unitary gate U to the quantum state.
 
@@ -47,9 +105,17 @@ class QuantumState:
 
         Args:
             U (np.ndarray): a 2x2 unitary matrix representing the gate.
+            name (str, optional): gate name. For the fixed gates X, Y, Z, H
+                the update is done with a closed-form rearrangement of ρ's
+                entries instead of multiplying by U.
         """
-        self.state = U @ self.state @ U.conj().T
-        self.history.append(self.state.copy())
+        kernel = FIXED_GATE_KERNELS.get(name)
+        if kernel is not None:
+            kernel(self._rho, self._rho)
+        else:
+            sandwich(U, self._rho, self._rho)
+        if self.track_history:
+            self.history.append(self.state.copy())
 
     def apply_kraus(self, kraus_ops):
         """
@@ -59,10 +125,58 @@ class QuantumState:
             ρ → Σ K_i ρ K_i†
 
         Args:
-            kraus_ops (List[np.ndarray]): list of 2x2 Kraus matrices.
+            kraus_ops (np.ndarray): stacked Kraus operators, shape (k, 2, 2)
+                (a list of 2x2 matrices is also accepted).
+        """
+        Ks = np.asarray(kraus_ops, dtype=complex)
+        apply_kraus_kernel(Ks, self._rho, self._rho)
+        if self.track_history:
+            self.history.append(self.state.copy())
+
+    # ---------- Closed-form noise channels ----------
+    # Equivalent to apply_kraus with the operators from noise.py, but written
+    # as the few scalar updates each channel reduces to on ρ = [[a, b], [c, d]].
+
+    def apply_depolarizing(self, p: float):
+        """
+        Depolarizing channel: ρ → (1-p) ρ + p I/2.
+
+        Args:
+            p (float): depolarizing probability, 0 ≤ p ≤ 1
+        """
+        self._buf *= 1.0 - p
+        self.re[0, 0] += 0.5 * p
+        self.re[1, 1] += 0.5 * p
+        if self.track_history:
+            self.history.append(self.state.copy())
+
+    def apply_phase_damping(self, lmbda: float):
+        """
+        Phase damping channel: off-diagonals shrink by (1-λ),
+        populations are unchanged.
+
+        Args:
+            lmbda (float): dephasing probability, 0 ≤ λ ≤ 1
+        """
+        self._rho[0, 1] *= 1.0 - lmbda
+        self._rho[1, 0] *= 1.0 - lmbda
+        if self.track_history:
+            self.history.append(self.state.copy())
+
+    def apply_amplitude_damping(self, gamma: float):
+        """
+        Amplitude damping channel:
+            a → a + γ d,   d → (1-γ) d,   b, c → sqrt(1-γ) b, sqrt(1-γ) c
+
+        Args:
+            gamma (float): damping probability, 0 ≤ γ ≤ 1
         """
-        new_state = np.zeros_like(self.state, dtype=complex)
-        for K in kraus_ops:
-            new_state += K @ self.state @ K.conj().T
-        self.state = new_state
-        self.history.append(self.state.copy())
+        rho = self._rho
+        d = rho[1, 1]
+        rho[0, 0] += gamma * d
+        rho[1, 1] = (1.0 - gamma) * d
+        s = sqrt(1.0 - gamma)
+        rho[0, 1] *= s
+        rho[1, 0] *= s
+        if self.track_history:
+            self.history.append(self.state.copy())
@@ -0,0 +1,135 @@
+import numpy as np
+
+# ---------- Density-Matrix Update Kernels ----------
+# For 2x2 matrices the cost of U @ rho @ U† is dominated by BLAS dispatch,
+# not arithmetic. When numba is available these kernels unroll the products
+# on complex scalars and are compiled once (cached on disk). Without numba
+# they fall back to plain NumPy so the backend still runs.
+#
+# All kernels write into a caller-provided `out` array, which may alias `rho`.
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    njit = None
+
+
+def _sandwich_unrolled(U, rho, out):
+    """
+    Compute out = U ρ U† for 2x2 matrices with fully unrolled arithmetic.
+
+    Args:
+        U (np.ndarray): 2x2 complex matrix.
+        rho (np.ndarray): 2x2 complex density matrix.
+        out (np.ndarray): 2x2 complex output buffer (may be `rho`).
+    """
+    u00 = U[0, 0]; u01 = U[0, 1]; u10 = U[1, 0]; u11 = U[1, 1]
+    r00 = rho[0, 0]; r01 = rho[0, 1]; r10 = rho[1, 0]; r11 = rho[1, 1]
+
+    # T = U ρ
+    t00 = u00 * r00 + u01 * r10
+    t01 = u00 * r01 + u01 * r11
+    t10 = u10 * r00 + u11 * r10
+    t11 = u10 * r01 + u11 * r11
+
+    # out = T U†
+    c00 = u00.conjugate(); c01 = u01.conjugate()
+    c10 = u10.conjugate(); c11 = u11.conjugate()
+    out[0, 0] = t00 * c00 + t01 * c01
+    out[0, 1] = t00 * c10 + t01 * c11
+    out[1, 0] = t10 * c00 + t11 * c01
+    out[1, 1] = t10 * c10 + t11 * c11
+    return out
+
+
+def _apply_kraus_unrolled(Ks, rho, out):
+    """
+    Compute out = Σ_k K_k ρ K_k† for a (k, 2, 2) stack of Kraus operators.
+
+    Args:
+        Ks (np.ndarray): stacked Kraus operators, shape (k, 2, 2).
+        rho (np.ndarray): 2x2 complex density matrix.
+        out (np.ndarray): 2x2 complex output buffer (may be `rho`).
+    """
+    r00 = rho[0, 0]; r01 = rho[0, 1]; r10 = rho[1, 0]; r11 = rho[1, 1]
+    s00 = 0j; s01 = 0j; s10 = 0j; s11 = 0j
+
+    for k in range(Ks.shape[0]):
+        u00 = Ks[k, 0, 0]; u01 = Ks[k, 0, 1]; u10 = Ks[k, 1, 0]; u11 = Ks[k, 1, 1]
+
+        t00 = u00 * r00 + u01 * r10
+        t01 = u00 * r01 + u01 * r11
+        t10 = u10 * r00 + u11 * r10
+        t11 = u10 * r01 + u11 * r11
+
+        c00 = u00.conjugate(); c01 = u01.conjugate()
+        c10 = u10.conjugate(); c11 = u11.conjugate()
+        s00 += t00 * c00 + t01 * c01
+        s01 += t00 * c10 + t01 * c11
+        s10 += t10 * c00 + t11 * c01
+        s11 += t10 * c10 + t11 * c11
+
+    out[0, 0] = s00; out[0, 1] = s01
+    out[1, 0] = s10; out[1, 1] = s11
+    return out
+
+
+# Closed forms of U ρ U† for the fixed gates, in terms of ρ = [[a, b], [c, d]].
+# These are permutations / sign flips (or, for H, sums) of ρ's entries and
+# need no multiplications by U at all.
+
+def _conj_x(rho, out):
+    """out = X ρ X = [[d, c], [b, a]]"""
+    a = rho[0, 0]; b = rho[0, 1]; c = rho[1, 0]; d = rho[1, 1]
+    out[0, 0] = d; out[0, 1] = c
+    out[1, 0] = b; out[1, 1] = a
+    return out
+
+
+def _conj_y(rho, out):
+    """out = Y ρ Y† = [[d, -c], [-b, a]]"""
+    a = rho[0, 0]; b = rho[0, 1]; c = rho[1, 0]; d = rho[1, 1]
+    out[0, 0] = d; out[0, 1] = -c
+    out[1, 0] = -b; out[1, 1] = a
+    return out
+
+
+def _conj_z(rho, out):
+    """out = Z ρ Z = [[a, -b], [-c, d]]"""
+    a = rho[0, 0]; b = rho[0, 1]; c = rho[1, 0]; d = rho[1, 1]
+    out[0, 0] = a; out[0, 1] = -b
+    out[1, 0] = -c; out[1, 1] = d
+    return out
+
+
+def _conj_h(rho, out):
+    """out = H ρ H = ½ [[a+b+c+d, a-b+c-d], [a+b-c-d, a-b-c+d]]"""
+    a = rho[0, 0]; b = rho[0, 1]; c = rho[1, 0]; d = rho[1, 1]
+    out[0, 0] = 0.5 * (a + b + c + d); out[0, 1] = 0.5 * (a - b + c - d)
+    out[1, 0] = 0.5 * (a + b - c - d); out[1, 1] = 0.5 * (a - b - c + d)
+    return out
+
+
+def _sandwich_numpy(U, rho, out):
+    """NumPy fallback for sandwich() when numba is not installed."""
+    out[...] = U @ rho @ U.conj().T
+    return out
+
+
+def _apply_kraus_numpy(Ks, rho, out):
+    """NumPy fallback for apply_kraus_kernel() when numba is not installed."""
+    out[...] = np.einsum("kij,jl,kml->im", Ks, rho, Ks.conj(), optimize=True)
+    return out
+
+
+if njit is not None:
+    sandwich = njit(cache=True, fastmath=True)(_sandwich_unrolled)
+    apply_kraus_kernel = njit(cache=True, fastmath=True)(_apply_kraus_unrolled)
+    _fixed = [njit(cache=True)(f) for f in (_conj_x, _conj_y, _conj_z, _conj_h)]
+else:
+    sandwich = _sandwich_numpy
+    apply_kraus_kernel = _apply_kraus_numpy
+    _fixed = [_conj_x, _conj_y, _conj_z, _conj_h]
+
+# Gate name -> specialized kernel computing out = U ρ U† without U.
+FIXED_GATE_KERNELS = dict(zip(("X", "Y", "Z", "H"), _fixed))
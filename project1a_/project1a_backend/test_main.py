@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+client = TestClient(main.app)
+
+
+def _gate(name, theta=None):
+    step = {"type": "gate", "name": name}
+    if theta is not None:
+        step["params"] = {"theta": theta}
+    return step
+
+
+def _noise(name, **params):
+    return {"type": "noise", "name": name, "params": params}
+
+
+_CIRCUITS = [
+    [],
+    [_gate("H")],
+    [_gate("Rx", 0.3), _noise("amplitude_damping", gamma=0.2), _gate("Y"),
+     _noise("phase_damping", **{"lambda": 0.3}), _gate("Rz", -0.7)],
+    [_gate("H"), _noise("depolarizing", p=0.4), _gate("Ry", 1.1)],
+    [_gate("X"), _gate("Z"), _noise("amplitude_damping"), _gate("H"),
+     _gate("Ry"), _noise("depolarizing"), _gate("Rx", 2.0), _gate("Z")],
+]
+
+
+def _assert_steps_match(batch_steps, single_steps):
+    assert len(batch_steps) == len(single_steps)
+    for b, s in zip(batch_steps, single_steps):
+        np.testing.assert_allclose(b["density_matrix"], s["density_matrix"], atol=1e-12)
+        for k in "xyz":
+            assert b["bloch_vector"][k] == pytest.approx(s["bloch_vector"][k], abs=1e-12)
+
+
+def test_run_circuits_matches_run_circuit():
+    batch = [
+        {"steps": steps, "observables": mode}
+        for mode in ("full", "bloch_only", "final")
+        for steps in _CIRCUITS
+    ]
+    response = client.post("/run_circuits", json=batch)
+    assert response.status_code == 200
+    results = response.json()["circuits"]
+    assert len(results) == len(batch)
+
+    for request, result in zip(batch, results):
+        single = client.post("/run_circuit", json=request).json()
+        if request["observables"] == "bloch_only":
+            expected = np.array(single["bloch_vectors"]).reshape(-1, 3)
+            got = np.array(result["bloch_vectors"]).reshape(-1, 3)
+            assert got.shape == (len(request["steps"]), 3)
+            np.testing.assert_allclose(got, expected, atol=1e-12)
+        else:
+            if request["observables"] == "final":
+                assert len(result["steps"]) == min(len(request["steps"]), 1)
+            _assert_steps_match(result["steps"], single["steps"])
+
+
+def test_run_circuits_rejects_too_many_circuits():
+    batch = [{"steps": []}] * (main.MAX_BATCH_CIRCUITS + 1)
+    assert client.post("/run_circuits", json=batch).status_code == 413
+
+
+def test_run_circuits_rejects_too_many_steps():
+    n = main.MAX_BATCH_STEPS // 2 + 1
+    batch = [{"steps": [_gate("X")] * n}] * 2
+    assert client.post("/run_circuits", json=batch).status_code == 413
+
+
+@pytest.mark.parametrize("accept, media_type", [
+    pytest.param("application/msgpack", "application/msgpack",
+                 marks=pytest.mark.skipif(main.msgpack is None, reason="msgpack not installed")),
+    ("application/msgpack;q=0", "application/json"),
+    ("application/msgpack;q=0.5, application/json", "application/json"),
+    ("*/*", "application/json"),
+    ("application/msgpack;q=abc", "application/json"),
+])
+def test_response_encoding_follows_accept(accept, media_type):
+    response = client.post("/run_circuit", json={"steps": [_gate("H")]},
+                           headers={"Accept": accept})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith(media_type)
+    assert "Accept" in response.headers["vary"]
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from noise import amplitude_damping, phase_damping, depolarizing
+from quantum_state import QuantumState
+
+
+def _mixed_state():
+    """A generic valid density matrix with nonzero coherences."""
+    A = np.array([[0.8 + 0.1j, 0.3 - 0.4j],
+                  [0.2 + 0.5j, 0.6 - 0.2j]])
+    rho = A @ A.conj().T
+    return rho / np.trace(rho)
+
+
+@pytest.mark.parametrize("value", [0.0, 0.3, 1.0])
+@pytest.mark.parametrize("method, kraus", [
+    (QuantumState.apply_amplitude_damping, amplitude_damping),
+    (QuantumState.apply_phase_damping, phase_damping),
+    (QuantumState.apply_depolarizing, depolarizing),
+])
+def test_closed_form_noise_matches_kraus(method, kraus, value):
+    closed = QuantumState(_mixed_state())
+    method(closed, value)
+
+    reference = QuantumState(_mixed_state())
+    reference.apply_kraus(kraus(value))
+
+    np.testing.assert_allclose(closed.state, reference.state, atol=1e-12)
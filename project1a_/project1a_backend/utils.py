@@ -1,17 +1,16 @@
 import numpy as np
 
-# ---------- Pauli Operators ----------
-# These are the standard Pauli matrices used to extract expectation values
-# and compute Bloch vectors.
-
-pauli_x = np.array([[0, 1],
-                    [1, 0]], dtype=complex)
+from gates import X as pauli_x, Y as pauli_y, Z as pauli_z
 
-pauli_y = np.array([[0, -1j],
-                    [1j, 0]], dtype=complex)
+# ---------- Pauli Operators ----------
+# pauli_x / pauli_y / pauli_z are the standard Pauli matrices, re-exported
+# from gates.py under their historical names. The Bloch vector below uses
+# their closed-form expectation values.
 
-pauli_z = np.array([[1, 0],
-                    [0, -1]], dtype=complex)
+__all__ = [
+    "pauli_x", "pauli_y", "pauli_z",
+    "bloch_vector", "serialize_density_matrix",
+]
 
 
 def bloch_vector(rho: np.ndarray):
@@ -23,16 +22,19 @@ def bloch_vector(rho: np.ndarray):
         y = Tr(ρ Y)
         z = Tr(ρ Z)
 
+    For a 2x2 ρ these reduce to closed forms in its entries, so no matrix
+    products are needed:
+        x = 2 Re(ρ01),  y = 2 Im(ρ10),  z = ρ00 - ρ11
+
     Args:
         rho (np.ndarray): 2x2 density matrix.
 
     Returns:
         dict: {"x": float, "y": float, "z": float}
     """
-    x = np.real(np.trace(rho @ pauli_x))
-    y = np.real(np.trace(rho @ pauli_y))
-    z = np.real(np.trace(rho @ pauli_z))
-    return {"x": float(x), "y": float(y), "z": float(z)}
+    a = complex(rho[0, 0]); b = complex(rho[0, 1])
+    c = complex(rho[1, 0]); d = complex(rho[1, 1])
+    return {"x": 2.0 * b.real, "y": 2.0 * c.imag, "z": a.real - d.real}
 
 
 def serialize_density_matrix(rho: np.ndarray):
@@ -48,13 +50,14 @@ def serialize_density_matrix(rho: np.ndarray):
         [[[1.0, 0.0], [0.0, 0.0]],
          [[0.0, 0.0], [0.0, 0.0]]]
 
+    complex128 is laid out in memory as interleaved (real, imag) float64
+    pairs, so the buffer is viewed as floats and converted with one tolist().
+
     Args:
         rho (np.ndarray): 2x2 density matrix.
 
     Returns:
         list[list[list[float]]]: serialized density matrix.
     """
-    return [
-        [[float(np.real(cell)), float(np.imag(cell))] for cell in row]
-        for row in rho
-    ]
+    rho = np.ascontiguousarray(rho, dtype=np.complex128)
+    return rho.view(np.float64).reshape(2, 2, 2).tolist()